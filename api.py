@@ -0,0 +1,246 @@
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import uuid
+from datetime import datetime
+from urllib.parse import quote
+
+import tornado.netutil
+import tornado.process
+import tornado.web
+from tornado.httpserver import HTTPServer
+from tornado.ioloop import IOLoop
+
+from assessment import (
+    MAX_SCORE,
+    get_maturity_level,
+    score_responses,
+    insert_to_bigquery,
+    generate_recommendations,
+    create_pdf,
+    ReportGenerationError,
+)
+
+
+API_PORT = int(os.getenv("API_PORT", "8000"))
+API_PROCESSES = int(os.getenv("API_PROCESSES", "0"))  # 0 = one process per CPU core
+API_DB_PATH = os.getenv("API_DB_PATH", "assessments.db")
+
+REQUIRED_USER_INFO = [
+    "Name",
+    "Company Name",
+    "About",
+    "Email",
+    "Domain",
+    "Data Team Size",
+    "AI Team Size",
+    "Organization Size",
+    "Annual Revenue",
+    "Customer Type",
+    "Data Volume",
+    "AI Leadership Support",
+]
+
+
+# Results are kept in SQLite so every forked worker process can serve any assessment
+def connect_db():
+    conn = sqlite3.connect(API_DB_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def init_db():
+    with connect_db() as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS assessments (
+                id TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                user_info TEXT NOT NULL,
+                responses TEXT NOT NULL,
+                total_score INTEGER NOT NULL,
+                maturity_level TEXT NOT NULL,
+                recommendations TEXT NOT NULL
+            )
+        """)
+
+
+def save_assessment(record):
+    with connect_db() as conn:
+        conn.execute(
+            "INSERT INTO assessments (id, created_at, user_info, responses, total_score, maturity_level, recommendations)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                record["id"],
+                record["created_at"],
+                json.dumps(record["user_info"]),
+                json.dumps(record["responses"]),
+                record["total_score"],
+                record["maturity_level"],
+                json.dumps(record["recommendations"]),
+            ),
+        )
+
+
+def load_assessment(assessment_id):
+    with connect_db() as conn:
+        row = conn.execute("SELECT * FROM assessments WHERE id = ?", (assessment_id,)).fetchone()
+    if row is None:
+        return None
+    record = dict(row)
+    record["user_info"] = json.loads(record["user_info"])
+    record["responses"] = json.loads(record["responses"])
+    record["recommendations"] = json.loads(record["recommendations"])
+    return record
+
+
+# Runs the blocking scoring / Gemini / BigQuery pipeline; called from the executor
+def run_assessment(user_info, responses):
+    total_score = score_responses(responses)
+    maturity_level = get_maturity_level(total_score)
+    assessment_json = json.dumps(responses, indent=2)
+    recommendations = generate_recommendations(user_info, total_score, maturity_level, assessment_json)
+
+    record = {
+        "id": uuid.uuid4().hex,
+        "created_at": datetime.now().isoformat(),
+        "user_info": user_info,
+        "responses": responses,
+        "total_score": total_score,
+        "maturity_level": maturity_level,
+        "recommendations": recommendations,
+    }
+    save_assessment(record)
+
+    # The assessment is already stored; a BigQuery failure is only reported in the response
+    try:
+        errors = insert_to_bigquery(user_info, total_score, maturity_level, responses, recommendations)
+    except Exception as e:
+        print(f"BigQuery insert failed for assessment {record['id']}: {e}")
+        return record, False
+    return record, errors == []
+
+
+def run_in_executor(func, *args):
+    return IOLoop.current().run_in_executor(None, func, *args)
+
+
+class BaseHandler(tornado.web.RequestHandler):
+    def write_error(self, status_code, **kwargs):
+        reason = self._reason
+        if "exc_info" in kwargs:
+            exc = kwargs["exc_info"][1]
+            if isinstance(exc, tornado.web.HTTPError) and exc.log_message:
+                reason = exc.log_message
+        self.finish({"error": reason})
+
+    async def get_assessment(self, assessment_id):
+        record = await run_in_executor(load_assessment, assessment_id)
+        if record is None:
+            raise tornado.web.HTTPError(404, "Assessment not found")
+        return record
+
+
+class SubmitAssessmentHandler(BaseHandler):
+    async def post(self):
+        try:
+            body = json.loads(self.request.body)
+        except ValueError:
+            raise tornado.web.HTTPError(400, "Request body must be valid JSON")
+        if not isinstance(body, dict):
+            raise tornado.web.HTTPError(400, "Request body must be a JSON object")
+
+        user_info = body.get("user_info")
+        responses = body.get("responses")
+        if not isinstance(user_info, dict) or not isinstance(responses, dict):
+            raise tornado.web.HTTPError(400, "Both 'user_info' and 'responses' objects are required")
+        missing = [key for key in REQUIRED_USER_INFO if key not in user_info]
+        if missing:
+            raise tornado.web.HTTPError(400, f"Missing user_info fields: {', '.join(missing)}")
+        invalid = [key for key in REQUIRED_USER_INFO if not isinstance(user_info[key], str)]
+        if invalid:
+            raise tornado.web.HTTPError(400, f"user_info fields must be strings: {', '.join(invalid)}")
+        try:
+            score_responses(responses)
+        except ValueError as e:
+            raise tornado.web.HTTPError(400, str(e))
+
+        try:
+            record, saved = await run_in_executor(run_assessment, user_info, responses)
+        except ReportGenerationError:
+            raise tornado.web.HTTPError(502, "Recommendation generation failed; please retry")
+        self.set_status(201)
+        self.finish({
+            "id": record["id"],
+            "total_score": record["total_score"],
+            "max_score": MAX_SCORE,
+            "maturity_level": record["maturity_level"],
+            "saved_to_bigquery": saved,
+        })
+
+
+class ScoreHandler(BaseHandler):
+    async def get(self, assessment_id):
+        record = await self.get_assessment(assessment_id)
+        self.finish({
+            "id": record["id"],
+            "total_score": record["total_score"],
+            "max_score": MAX_SCORE,
+            "maturity_level": record["maturity_level"],
+        })
+
+
+class RecommendationsHandler(BaseHandler):
+    async def get(self, assessment_id):
+        record = await self.get_assessment(assessment_id)
+        self.finish({
+            "id": record["id"],
+            "recommendations": record["recommendations"],
+        })
+
+
+class PDFHandler(BaseHandler):
+    async def get(self, assessment_id):
+        record = await self.get_assessment(assessment_id)
+        pdf_buffer = await run_in_executor(
+            create_pdf,
+            record["user_info"],
+            record["total_score"],
+            record["maturity_level"],
+            record["recommendations"],
+        )
+        company_name = re.sub(r"[\x00-\x1f\x7f]", "", record["user_info"]["Company Name"])
+        filename = f"{company_name}_Pharma_Assessment_Report.pdf"
+        # ASCII-only fallback plus the RFC 5987 form, so quotes and CR/LF never reach the header
+        fallback = re.sub(r'[^A-Za-z0-9._ -]', "_", filename)
+        self.set_header("Content-Type", "application/pdf")
+        self.set_header(
+            "Content-Disposition",
+            f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}",
+        )
+        self.finish(pdf_buffer.getvalue())
+
+
+def make_app():
+    return tornado.web.Application([
+        (r"/assessments", SubmitAssessmentHandler),
+        (r"/assessments/([0-9a-f]{32})/score", ScoreHandler),
+        (r"/assessments/([0-9a-f]{32})/recommendations", RecommendationsHandler),
+        (r"/assessments/([0-9a-f]{32})/pdf", PDFHandler),
+    ])
+
+
+async def serve(sockets):
+    server = HTTPServer(make_app())
+    server.add_sockets(sockets)
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    init_db()
+    # Bind once, then pre-fork so every worker process accepts on the shared socket
+    sockets = tornado.netutil.bind_sockets(API_PORT)
+    tornado.process.fork_processes(API_PROCESSES)
+    asyncio.run(serve(sockets))
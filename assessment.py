@@ -0,0 +1,662 @@
+import os
+import google.generativeai as genai
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from io import BytesIO
+from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+import json
+from google.cloud import bigquery
+from dotenv import load_dotenv
+from section_cache import SectionCache, section_key
+
+load_dotenv()
+
+# Set environment variable for Google Cloud authentication
+os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "test.json"
+
+
+# Set your Google Gemini API key here
+genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+
+
+# Generate each recommendation section as its own concurrent prompt instead of one request for the whole report
+PARALLEL_RECOMMENDATIONS = os.getenv("PARALLEL_RECOMMENDATIONS", "false").lower() == "true"
+
+
+# Define questions and their corresponding options with scores
+questions = {
+  "Field Intelligence & Real-World Insights": [
+    {
+      "question": "1. How effectively is your organization capturing real-world insights from doctor and chemist visits?",
+      "options": {
+        "(a) Minimal - No systematic collection of field insights": 0,
+        "(b) Basic - Manual documentation with limited utilization": 1,
+        "(c) Moderate - Structured collection with partial digital transformation": 2,
+        "(d) Advanced - Comprehensive digital capture with AI-enabled analysis": 3
+      }
+    },
+    {
+      "question": "2. To what extent are voice notes and unstructured data from field teams converted into actionable insights?",
+      "options": {
+        "(a) Not utilized - Voice data rarely captured or analyzed": 0,
+        "(b) Limited - Basic transcription without systematic analysis": 1,
+        "(c) Developing - Regular transcription with semi-automated analysis": 2,
+        "(d) Sophisticated - Automated transcription with AI-powered insights extraction": 3
+      }
+    },
+    {
+      "question": "3. How effectively is your organization utilizing GenAI models to analyze field intelligence data?",
+      "options": {
+        "(a) <10% utilization - Minimal AI integration for field data": 0,
+        "(b) 10-30% utilization - Basic AI implementation for specific insights": 1,
+        "(c) 31-60% utilization - Moderate AI integration across multiple field data types": 2,
+        "(d) >60% utilization - Extensive AI-powered analysis of field intelligence": 3
+      }
+    }
+  ],
+ 
+  "Domain-Specific AI Applications": [
+    {
+      "question": "4. How effectively is AI employed to identify and adapt to evolving pharmaceutical trends and insights?",
+      "options": {
+        "(a) Not implemented - No dynamic parameter identification": 0,
+        "(b) Basic application - Limited trend identification capabilities": 1,
+        "(c) Moderate implementation - Regular trend identification with some adaptation": 2,
+        "(d) Advanced system - Agentic AI with dynamic parameter identification": 3
+      }
+    },
+    {
+      "question": "5. To what extent are your AI systems customized specifically for pharmaceutical domain knowledge?",
+      "options": {
+        "(a) Generic AI systems with no domain customization": 0,
+        "(b) Limited customization for basic pharmaceutical terminology": 1,
+        "(c) Moderate domain adaptation with pharmaceutical-specific training": 2,
+        "(d) Comprehensive domain-specific models with deep pharmaceutical knowledge": 3
+      }
+    },
+    {
+      "question": "6. How sophisticated is your organization's use of AI for persona analysis in healthcare professional engagement?",
+      "options": {
+        "(a) Not utilized - Traditional segmentation approaches only": 0,
+        "(b) Basic implementation - Simple AI-based segmentation": 1,
+        "(c) Moderate utilization - AI-driven persona development": 2,
+        "(d) Advanced application - Dynamic persona analysis with behavioral insights": 3
+      }
+    }
+  ],
+
+
+  "Data Processing & Quality": [
+    {
+      "question": "7. How effectively does your organization maintain consistency and accuracy when processing large volumes of voice data?",
+      "options": {
+        "(a) Inconsistent quality with significant error rates": 0,
+        "(b) Basic quality control with manual verification": 1,
+        "(c) Structured quality assurance with moderate consistency": 2,
+        "(d) Advanced quality management with high accuracy at scale": 3
+      }
+    },
+    {
+      "question": "8. To what extent has your organization implemented vector databases for efficient retrieval of pharmaceutical insights?",
+      "options": {
+        "(a) Not implemented - Traditional databases only": 0,
+        "(b) Early exploration - Limited vector search capabilities": 1,
+        "(c) Partial implementation - Vector databases for select applications": 2,
+        "(d) Full implementation - Comprehensive vector search infrastructure": 3
+      }
+    },
+    {
+      "question": "9. How sophisticated is your transcription capability for converting field audio into analyzable text?",
+      "options": {
+        "(a) Basic or non-existent - Limited transcription capabilities": 0,
+        "(b) Standard transcription with moderate accuracy": 1,
+        "(c) Advanced transcription with multilingual support": 2,
+        "(d) High-performance transcription with contextual understanding": 3
+      }
+    }
+  ],
+
+
+  "User Experience & Adoption": [
+    {
+      "question": "10. How would you rate the user experience of AI tools for your field teams and managers?",
+      "options": {
+        "(a) Complex and difficult to use, limiting adoption": 0,
+        "(b) Functional but requiring significant training": 1,
+        "(c) User-friendly with moderate learning curve": 2,
+        "(d) Highly intuitive with excellent usability driving widespread adoption": 3
+      }
+    },
+    {
+      "question": "11. To what degree can users interact conversationally with your data systems for instant analysis?",
+      "options": {
+        "(a) No conversational capabilities - Traditional query methods only": 0,
+        "(b) Limited chat functionality with basic responses": 1,
+        "(c) Moderate conversational abilities for standard queries": 2,
+        "(d) Advanced conversational AI with deep analytical capabilities": 3
+      }
+    },
+    {
+      "question": "12. How effectively are pre-built AI modules deployed for common pharmaceutical use cases?",
+      "options": {
+        "(a) Not available - Custom solutions required for each use case": 0,
+        "(b) Limited availability - Basic modules with minimal customization": 1,
+        "(c) Moderate deployment - Several modules with configuration options": 2,
+        "(d) Comprehensive library - Extensive pre-built modules with deep customization": 3
+      }
+    }
+  ],
+
+
+  "Integration & Scalability": [
+    {
+      "question": "13. How well integrated are your AI systems with existing pharmaceutical workflows and processes?",
+      "options": {
+        "(a) Minimal integration - AI systems operate in isolation": 0,
+        "(b) Partial integration - Basic connections to select workflows": 1,
+        "(c) Substantial integration - AI embedded in multiple critical processes": 2,
+        "(d) Seamless integration - AI fully incorporated into daily operations": 3
+      }
+    },
+    {
+      "question": "14. How effectively can your AI infrastructure scale to accommodate growing volumes of field data?",
+      "options": {
+        "(a) Limited scalability - Performance issues with increased data": 0,
+        "(b) Moderate scalability - Can handle growth with some constraints": 1,
+        "(c) Good scalability - Designed for significant data volume increases": 2,
+        "(d) Excellent scalability - Robust architecture for enterprise-scale data": 3
+      }
+    },
+    {
+      "question": "15. How comprehensively does your organization secure sensitive data in AI applications?",
+      "options": {
+        "(a) Basic security measures with significant vulnerabilities": 0,
+        "(b) Standard security protocols with some gaps": 1,
+        "(c) Advanced security framework with strong protections": 2,
+        "(d) Enterprise-grade security with complete compliance coverage": 3
+      }
+    }
+  ]
+}
+
+
+maturity_levels = [
+    (31, 45, "Advanced - Strategically Optimized"),  # Next 33% score range: Strong AI application and data practices, with clear strategic direction.
+    (16, 30, "Emerging - Building Foundations"),  # Middle 33% score range: Solid AI capabilities and data maturity, integrated into critical pharma functions.
+    (0, 15, "Novice - Exploring Opportunities")  # Bottom 33% score range: Early-stage or limited adoption of AI, working on foundational capabilities.
+]
+
+
+MAX_SCORE = 45
+
+
+def get_maturity_level(score):
+    for min_score, max_score, level in maturity_levels:
+        if min_score <= score <= max_score:
+            return level
+    return "Undefined"
+
+
+def get_score_distribution_info():
+    return (
+        "Score Distribution for Maturity Levels:\n"
+        "31-45: Advanced - Strategically Optimized\n"
+        "16-30: Emerging - Building Foundations\n"
+        "0-15: Novice - Exploring Opportunities"
+    )
+
+
+# Function to score a full set of responses ({question: selected option(s)})
+def score_responses(responses):
+    total_score = 0
+    for category in questions.values():
+        for q in category:
+            if q["question"] not in responses:
+                raise ValueError(f"Missing response for question: {q['question']}")
+            answer = responses[q["question"]]
+            if q.get("multiple_choice", False):
+                if not isinstance(answer, list) or not all(isinstance(option, str) for option in answer):
+                    raise ValueError(f"Response for question {q['question']} must be a list of options")
+                selected = answer
+            else:
+                if not isinstance(answer, str):
+                    raise ValueError(f"Response for question {q['question']} must be a single option")
+                selected = [answer]
+            for option in selected:
+                if option not in q["options"]:
+                    raise ValueError(f"Invalid option for question {q['question']}: {option}")
+                total_score += q["options"][option]
+    return total_score
+
+
+# Function to score each category: {category: (score, max_score)}
+def category_scores(responses):
+    scores = {}
+    for category, category_questions in questions.items():
+        score = 0
+        max_score = 0
+        for q in category_questions:
+            answer = responses.get(q["question"])
+            selected = (answer or []) if q.get("multiple_choice", False) else [answer]
+            score += sum(q["options"].get(option, 0) for option in selected)
+            max_score += max(q["options"].values())
+        scores[category] = (score, max_score)
+    return scores
+
+
+# Function to insert an assessment row into BigQuery; returns the insert errors
+def insert_to_bigquery(user_info, total_score, maturity_level, responses, recommendations):
+    client = bigquery.Client()
+    dataset_id = "audit"  # Replace with your dataset ID
+    table_id = "auditplus"  # Replace with your table name
+
+
+    # Prepare responses as JSON
+    response_json = json.dumps(responses, indent=2)
+
+
+    rows_to_insert = [{
+        "timestamp": datetime.now().isoformat(),
+        "name": user_info["Name"],
+        "company_name": user_info["Company Name"],
+        "about_company": user_info["About"],
+        "email": user_info["Email"],
+        "domain": user_info["Domain"],
+        "data_team_size": user_info["Data Team Size"],
+        "ai_team_size": user_info["AI Team Size"],
+        "organization_size": user_info["Organization Size"],
+        "annual_revenue": user_info["Annual Revenue"],
+        "customer_type": user_info["Customer Type"],
+        "data_volume": user_info["Data Volume"],
+        "ai_leadership_support": user_info["AI Leadership Support"],
+        "total_score": total_score,
+        "maturity_level": maturity_level,
+        "reponse": response_json,
+        "recommendations": json.dumps(recommendations)  # Include recommendations here
+    }]
+
+
+    table_ref = f"{dataset_id}.{table_id}"
+    print(table_ref)
+    errors = client.insert_rows_json(table_ref, rows_to_insert)
+    print(errors)
+    return errors
+
+
+VALENCE_CAPABILITIES = [
+    "Upload voice and media files from field visits or internal teams.",
+    "Transcribe those files with multilingual and pharma-specific accuracy.",
+    "Interact with the content using chat-based Q&A over transcripts.",
+    "Search across thousands of conversations using vector database indexing (Qdrant).",
+    "Extract real-world insights across therapeutic areas, product feedback, regulatory challenges, and more.",
+]
+
+
+# Sections of the recommendations report, in display order: (key, heading, guidance)
+REPORT_SECTIONS = [
+    ("overview", "Overview",
+     "A short paragraph interpreting the organization’s current standing based on the score and profile, and how this reflects their AI maturity across field insights, quality, and regulatory intelligence."),
+    ("strengths", "Strengths",
+     "2–3 items highlighting the strongest categories in the category scores given above."),
+    ("gaps", "Gaps",
+     "2–3 items analyzing the weakest categories in the category scores given above: where voice insights, regulatory document extraction, or field feedback structuring are lacking."),
+    ("short_term", "Short-Term (0–6 Months)",
+     "3–4 quick wins aligned with onboarding Valence Pharma GPT (e.g., uploading voice logs, generating transcripts), prioritizing the weakest categories."),
+    ("medium_term", "Medium-Term (6–18 Months)",
+     "3–4 items on strategic adoption of multilingual transcription, searchable insights, or cross-conversation pattern mining."),
+    ("long_term", "Long-Term (18+ Months)",
+     "3–4 items on full pipeline automation from field voice input to insight delivery and compliance reporting."),
+]
+
+RECOMMENDATION_HORIZONS = ["short_term", "medium_term", "long_term"]
+
+# Sections only the long-form detailed report has: (key, heading, guidance)
+DETAILED_REPORT_SECTIONS = [
+    ("executive_summary", "Executive Summary",
+     "A paragraph summarizing the organization’s maturity, its most important findings and the headline recommendation."),
+    ("category_analysis", "Category-by-Category Analysis",
+     "One entry per assessment category: its current state, the evidence from the answers, and the risks of leaving it as is."),
+    ("success_metrics", "Success Metrics",
+     "3–5 measurable indicators for tracking progress on the roadmap, each naming the horizon it belongs to."),
+    ("next_steps", "Next Steps",
+     "3–4 concrete next steps, ending with exploring https://valenceai.io to begin the adoption pathway."),
+]
+
+# Display order of every section a report can contain
+REPORT_LAYOUT = [
+    "executive_summary", "overview", "category_analysis", "strengths", "gaps",
+    "short_term", "medium_term", "long_term", "success_metrics", "next_steps",
+]
+
+TEXT_SECTIONS = {"overview", "executive_summary"}
+CATEGORY_ANALYSIS_FIELDS = ["category", "current_state", "evidence", "risks"]
+
+PROFILE_FIELDS = [
+    ("Company Name", "Name"),
+    ("Domain", "Domain"),
+    ("Organization Size", "Size"),
+    ("Annual Revenue", "Annual Revenue"),
+    ("Data Team Size", "Data Team Size"),
+    ("AI Team Size", "AI Team Size"),
+    ("AI Leadership Support", "AI Leadership Support"),
+    ("Regulatory Compliance", "Regulatory Compliance"),
+    ("Clinical Trials Data", "Clinical Trials Data Handling"),
+    ("Customer Type", "Customer Type"),
+    ("Data Volume", "Data Volume"),
+]
+
+# Bump when the prompt or schema changes so cached sections are regenerated
+REPORT_PROMPT_VERSION = 2
+
+_section_cache = None
+
+
+def get_section_cache():
+    global _section_cache
+    if _section_cache is None:
+        _section_cache = SectionCache()
+    return _section_cache
+
+
+def rank_categories(scores):
+    return sorted(scores, key=lambda category: scores[category][0] / scores[category][1], reverse=True)
+
+
+def report_schema(sections):
+    properties = {}
+    for section in sections:
+        if section in TEXT_SECTIONS:
+            properties[section] = {"type": "string"}
+        elif section == "category_analysis":
+            properties[section] = {"type": "array", "items": {
+                "type": "object",
+                "properties": {field: {"type": "string"} for field in CATEGORY_ANALYSIS_FIELDS},
+                "required": CATEGORY_ANALYSIS_FIELDS,
+            }}
+        else:
+            properties[section] = {"type": "array", "items": {"type": "string"}}
+    return {"type": "object", "properties": properties, "required": list(sections)}
+
+
+# Parses the model's JSON output and checks it has every requested section
+def parse_report(text, sections):
+    report = json.loads(text)
+    for section in sections:
+        value = report.get(section)
+        if section in TEXT_SECTIONS:
+            valid = isinstance(value, str)
+        elif section == "category_analysis":
+            valid = isinstance(value, list) and all(
+                isinstance(item, dict) and all(isinstance(item.get(field), str) for field in CATEGORY_ANALYSIS_FIELDS)
+                for item in value
+            )
+        else:
+            valid = isinstance(value, list) and all(isinstance(item, str) for item in value)
+        if not valid:
+            raise ValueError(f"Model output is missing the '{section}' section")
+    return {section: report[section] for section in sections}
+
+
+# Inputs a cached section is generated from; its prompt shows exactly these and nothing else
+def section_inputs(section, user_info, total_score, maturity_level, scores, ranked):
+    if section == "overview":
+        return {
+            "profile": {field: user_info.get(field) for field, _ in PROFILE_FIELDS},
+            "total_score": total_score,
+            "maturity_level": maturity_level,
+            "category_scores": scores,
+        }
+    inputs = {"domain": user_info.get("Domain"), "maturity_level": maturity_level}
+    if section == "strengths":
+        inputs["category_scores"] = {category: scores[category] for category in ranked[:2]}
+    elif section == "gaps":
+        inputs["category_scores"] = {category: scores[category] for category in ranked[-2:]}
+    else:
+        inputs["weakest_categories"] = ranked[-2:]
+    return inputs
+
+
+def build_report_context(inputs, current_date=None, responses=None):
+    capability_lines = "\n".join(f"- {capability}" for capability in VALENCE_CAPABILITIES)
+
+
+    context = """
+You are acting as a Senior Consultant specializing in AI and Data Maturity for the Pharmaceutical Industry.
+"""
+    if current_date is not None:
+        context += f"""
+
+Today’s Date: {current_date}
+"""
+    context += f"""
+
+The organization has completed a domain-specific assessment designed to evaluate its readiness for advanced AI integration through **Valence Pharma GPT** — a purpose-built GenAI solution for Pharma that transforms unstructured field insights into searchable, actionable, and multilingual intelligence.
+
+
+### What is Valence Pharma GPT?
+Valence Pharma GPT is a secure, configurable AI assistant that enables pharma organizations to:
+{capability_lines}
+
+
+**Do not invent new modules or capabilities. Only refer to features described above.**
+
+"""
+    if "profile" in inputs:
+        profile_lines = "\n".join(
+            f"- **{label}**: {inputs['profile'].get(field)}"
+            for field, label in PROFILE_FIELDS
+        )
+        context += f"\n**Organization Profile:**\n{profile_lines}\n"
+    if "domain" in inputs:
+        context += f"\n**Domain**: {inputs['domain']}\n"
+    if "total_score" in inputs:
+        context += f"\n**Assessment Score**: {inputs['total_score']} / {MAX_SCORE}\n"
+    if "maturity_level" in inputs:
+        context += f"\n**Maturity Level**: {inputs['maturity_level']}\n"
+    if "category_scores" in inputs:
+        category_lines = "\n".join(
+            f"- {category}: {score} / {max_score}"
+            for category, (score, max_score) in inputs["category_scores"].items()
+        )
+        context += f"\n**Category Scores** (each question scored on a 0–3 scale, 0 = Minimal, 3 = Advanced):\n{category_lines}\n"
+    if "weakest_categories" in inputs:
+        context += f"\n**Weakest Categories**: {', '.join(inputs['weakest_categories'])}\n"
+    if responses is not None:
+        response_lines = "\n".join(
+            f"- {question}\n  Answer: {answer}"
+            for question, answer in responses.items()
+        )
+        context += f"\n**Responses:**\n{response_lines}\n"
+    return context
+
+
+def build_report_prompt(context, sections, detailed=False):
+    guidance = {key: text for key, _, text in REPORT_SECTIONS + DETAILED_REPORT_SECTIONS}
+    field_lines = "\n".join(f"- `{section}`: {guidance[section]}" for section in sections)
+    if detailed:
+        style = "This is the detailed report read after the session: make every item 2–4 sentences, explain the reasoning and tie it back to specific answers."
+    else:
+        style = "Keep every item to one or two sentences."
+
+
+    return context + f"""
+
+### Your Objective:
+Using only the information above, write the following fields of a JSON document:
+{field_lines}
+
+Your tone should be strategic, pharma-specific and executive-style. {style} Write plain text without markdown.
+"""
+
+
+class ReportGenerationError(Exception):
+    pass
+
+
+# Calls Gemini with a JSON schema covering just the requested sections; retries once on unusable output
+def request_sections(prompt, sections, attempts=2):
+    model = genai.GenerativeModel(
+        'gemini-1.5-flash',
+        generation_config=genai.GenerationConfig(
+            response_mime_type="application/json",
+            response_schema=report_schema(sections),
+        ),
+    )
+    messages = [{"role": "user", "parts": prompt}]
+    for attempt in range(attempts):
+        response = model.generate_content(messages)
+        try:
+            return parse_report(response.text, sections)
+        except ValueError as e:  # includes JSONDecodeError and blocked responses without text
+            error = e
+            print(f"Unusable model output for {', '.join(sections)} (attempt {attempt + 1} of {attempts}): {e}")
+    raise ReportGenerationError(f"Could not generate the {', '.join(sections)} section(s): {error}")
+
+
+# Function to generate recommendations as a structured report {section: text or [items]}
+def generate_recommendations(user_info, total_score, maturity_level, assessment_json, parallel=None):
+    if parallel is None:
+        parallel = PARALLEL_RECOMMENDATIONS
+
+
+    scores = category_scores(json.loads(assessment_json))
+    ranked = rank_categories(scores)
+    sections = [key for key, _, _ in REPORT_SECTIONS]
+    inputs = {
+        section: section_inputs(section, user_info, total_score, maturity_level, scores, ranked)
+        for section in sections
+    }
+    keys = {section: section_key(section, [REPORT_PROMPT_VERSION, inputs[section]]) for section in sections}
+
+
+    cache = get_section_cache()
+    cached = cache.get_many(keys.values())
+    report = {section: cached[keys[section]] for section in sections if keys[section] in cached}
+    missing = [section for section in sections if section not in report]
+
+
+    if missing:
+        # Sections sharing the same inputs (the three horizons) share a request unless parallel mode splits every
+        # section; the requests always run concurrently, so wall time is that of the slowest one
+        groups = {}
+        for section in missing:
+            group_key = section if parallel else json.dumps(inputs[section], sort_keys=True)
+            groups.setdefault(group_key, []).append(section)
+
+
+        def request_group(group):
+            prompt = build_report_prompt(build_report_context(inputs[group[0]]), group)
+            return request_sections(prompt, group)
+
+
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            for part in executor.map(request_group, groups.values()):
+                report.update(part)
+        cache.set_many({keys[section]: report[section] for section in missing})
+
+
+    # Assemble in a fixed order for the UI, BigQuery and the PDF
+    return {section: report[section] for section in sections}
+
+
+# Function to generate the long-form detailed report (run by the background worker)
+def generate_detailed_report(user_info, total_score, maturity_level, responses):
+    inputs = {
+        "profile": {field: user_info.get(field) for field, _ in PROFILE_FIELDS},
+        "total_score": total_score,
+        "maturity_level": maturity_level,
+        "category_scores": category_scores(responses),
+    }
+    context = build_report_context(inputs, datetime.now().strftime("%d-%B-%Y"), responses)
+    return request_sections(build_report_prompt(context, REPORT_LAYOUT, detailed=True), REPORT_LAYOUT)
+
+
+
+# Function to build the PDF report
+def create_pdf(user_info, total_score, maturity_level, recommendations, title="Pharma Assessment Report"):
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    styles = getSampleStyleSheet()
+    elements = []
+
+
+    # Title
+    elements.append(Paragraph(escape(title), styles["Title"]))
+    elements.append(Spacer(1, 12))
+
+
+    # Organization Information
+   
+    elements.append(Paragraph(f"Company Name: {escape(str(user_info['Company Name']))}", styles["Normal"]))
+    if 'Department' in user_info:
+        elements.append(Paragraph(f"Department: {escape(str(user_info['Department']))}", styles["Normal"]))
+    if 'Contact Person' in user_info:
+        elements.append(Paragraph(f"Contact Person: {escape(str(user_info['Contact Person']))}", styles["Normal"]))
+
+
+    elements.append(Spacer(1, 12))
+
+
+    # Add a Date field
+    elements.append(Paragraph(f"Date: {date.today().strftime('%Y-%m-%d')}", styles["Normal"]))
+
+
+    elements.append(Spacer(1, 12))
+   
+    # Assessment Results
+    assessment_title = Paragraph("Assessment Results", styles["Heading1"])
+    elements.append(assessment_title)
+
+
+    elements.append(Paragraph(f"Total Score: {total_score} / {MAX_SCORE}", styles["Normal"]))
+    elements.append(Paragraph(f"Maturity Level: {maturity_level}", styles["Normal"]))
+
+
+    elements.append(Spacer(1, 12))
+
+
+    # Recommendations Section
+    recommendations_title = Paragraph("Recommendations", styles["Heading1"])
+    elements.append(recommendations_title)
+
+
+    elements.append(Paragraph("About Valence Pharma GPT", styles["Heading2"]))
+    for capability in VALENCE_CAPABILITIES:
+        elements.append(Paragraph(f"• {escape(capability)}", styles["Normal"]))
+    elements.append(Paragraph("For live product access and demos, visit: https://valenceai.io", styles["Normal"]))
+    elements.append(Spacer(1, 12))
+
+
+    headings = {key: heading for key, heading, _ in REPORT_SECTIONS + DETAILED_REPORT_SECTIONS}
+    for key in REPORT_LAYOUT:
+        if key not in recommendations:
+            continue  # detailed-only sections are absent from the short report
+        if key == RECOMMENDATION_HORIZONS[0]:
+            elements.append(Paragraph("Roadmap", styles["Heading2"]))
+        heading_style = styles["Heading3"] if key in RECOMMENDATION_HORIZONS else styles["Heading2"]
+        elements.append(Paragraph(headings[key], heading_style))
+
+
+        value = recommendations[key]
+        if isinstance(value, str):
+            elements.append(Paragraph(escape(value), styles["Normal"]))
+        elif key == "category_analysis":
+            for item in value:
+                elements.append(Paragraph(escape(item["category"]), styles["Heading3"]))
+                elements.append(Paragraph(f"<b>Current state:</b> {escape(item['current_state'])}", styles["Normal"]))
+                elements.append(Paragraph(f"<b>Evidence:</b> {escape(item['evidence'])}", styles["Normal"]))
+                elements.append(Paragraph(f"<b>Risks:</b> {escape(item['risks'])}", styles["Normal"]))
+                elements.append(Spacer(1, 6))
+        else:
+            for item in value:
+                elements.append(Paragraph(f"• {escape(item)}", styles["Normal"]))
+                elements.append(Spacer(1, 6))
+        elements.append(Spacer(1, 12))
+
+
+    doc.build(elements)
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,165 @@
+import json
+import os
+import sqlite3
+import time
+import uuid
+
+
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "jobs.db")
+JOBS_MAX_RUNNING = int(os.getenv("JOBS_MAX_RUNNING", "4"))  # across all worker processes
+JOBS_LEASE_SECONDS = int(os.getenv("JOBS_LEASE_SECONDS", "600"))
+JOBS_RETRY_DELAY_SECONDS = int(os.getenv("JOBS_RETRY_DELAY_SECONDS", "30"))
+
+# Job priorities: higher runs first
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 0
+PRIORITY_LOW = -10
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+# Persistent job queue shared by the Streamlit app, the API and the worker processes
+class JobQueue:
+    def __init__(self, path=JOBS_DB_PATH, max_running=JOBS_MAX_RUNNING, lease_seconds=JOBS_LEASE_SECONDS):
+        self.path = path
+        self.max_running = max_running
+        self.lease_seconds = lease_seconds
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    run_after REAL NOT NULL,
+                    lease_expires REAL,
+                    worker TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority DESC, created_at)")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # Job IDs are UUIDs so an ID checkpointed on one host never matches another host's job
+    def enqueue(self, kind, payload, priority=PRIORITY_NORMAL, max_attempts=3):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, payload, priority, status, max_attempts, run_after, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(payload), priority, QUEUED, max_attempts, now, now, now),
+            )
+        return job_id
+
+    # Atomically takes the highest-priority ready job, or returns None
+    def claim(self, worker):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # Jobs whose worker died without finishing go back to the queue, or fail once out of attempts
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_expires = NULL, updated_at = ?"
+                " WHERE status = ? AND lease_expires < ? AND attempts >= max_attempts",
+                (FAILED, "Lease expired on the final attempt", now, RUNNING, now),
+            )
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, updated_at = ?"
+                " WHERE status = ? AND lease_expires < ?",
+                (QUEUED, now, RUNNING, now),
+            )
+            running = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (RUNNING,)).fetchone()[0]
+            if running >= self.max_running:
+                conn.execute("COMMIT")
+                return None
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? AND run_after <= ? ORDER BY priority DESC, created_at LIMIT 1",
+                (QUEUED, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, worker = ?, lease_expires = ?, updated_at = ?"
+                " WHERE id = ?",
+                (RUNNING, worker, now + self.lease_seconds, now, row["id"]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        job = self._to_job(row)
+        job["status"] = RUNNING
+        job["attempts"] += 1
+        job["worker"] = worker
+        return job
+
+    # Extends the lease while the worker still owns the job; returns False once ownership is lost
+    def renew(self, job_id, worker):
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND status = ? AND worker = ?",
+                (time.time() + self.lease_seconds, time.time(), job_id, RUNNING, worker),
+            )
+            return cursor.rowcount == 1
+
+    # Completion and failure only apply while the caller still owns the job
+    def complete(self, job_id, worker, result):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_expires = NULL, updated_at = ?"
+                " WHERE id = ? AND status = ? AND worker = ?",
+                (DONE, json.dumps(result), time.time(), job_id, RUNNING, worker),
+            )
+
+    # Retries with linear backoff until max_attempts, then marks the job failed
+    def fail(self, job_id, worker, error):
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = ? AND worker = ?",
+                (job_id, RUNNING, worker),
+            ).fetchone()
+            if row is None:
+                return
+            if row["attempts"] < row["max_attempts"]:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, worker = NULL, lease_expires = NULL, run_after = ?, updated_at = ?"
+                    " WHERE id = ? AND status = ? AND worker = ?",
+                    (QUEUED, error, now + JOBS_RETRY_DELAY_SECONDS * row["attempts"], now, job_id, RUNNING, worker),
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, lease_expires = NULL, updated_at = ?"
+                    " WHERE id = ? AND status = ? AND worker = ?",
+                    (FAILED, error, now, job_id, RUNNING, worker),
+                )
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row is not None else None
+
+    def _to_job(self, row):
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
@@ -0,0 +1,54 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+
+SECTION_CACHE_PATH = os.getenv("SECTION_CACHE_PATH", "sections.db")
+SECTION_CACHE_TTL_SECONDS = int(os.getenv("SECTION_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+
+# Stable cache key for one report section generated from the given inputs
+def section_key(section, inputs):
+    raw = json.dumps([section, inputs], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# Generated recommendation sections shared by the Streamlit app and the API
+class SectionCache:
+    def __init__(self, path=SECTION_CACHE_PATH, ttl_seconds=SECTION_CACHE_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sections (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def get_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        placeholders = ", ".join("?" for _ in keys)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT key, value FROM sections WHERE key IN ({placeholders}) AND created_at >= ?",
+                (*keys, time.time() - self.ttl_seconds),
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def set_many(self, items):
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sections (key, value, created_at) VALUES (?, ?, ?)",
+                [(key, json.dumps(value), now) for key, value in items.items()],
+            )
@@ -0,0 +1,118 @@
+import json
+import os
+import secrets
+import sqlite3
+import time
+
+from assessment import questions
+
+
+# sqlite:///path/to/sessions.db (default) or redis://host:6379/0 for any Redis-compatible server
+SESSION_STORE_URL = os.getenv("SESSION_STORE_URL", "sqlite:///sessions.db")
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Session keys that are checkpointed; everything else (widgets, futures) stays local to the replica
+# recommendations and bigquery_errors keep a resumed results page from regenerating or re-inserting
+SESSION_KEYS = [
+    "page",
+    "current_question_index",
+    "total_score",
+    "user_info",
+    "responses",
+    "recommendations",
+    "bigquery_errors",
+    "detailed_report_job",
+]
+
+_all_questions = [q for category in questions.values() for q in category]
+
+
+def new_token():
+    return secrets.token_urlsafe(16)
+
+
+# Compact form: responses are stored as {question index: option index (or list of indexes)}
+def pack_state(session):
+    state = {key: session[key] for key in SESSION_KEYS if key in session}
+    responses = {}
+    for i, q in enumerate(_all_questions):
+        if q["question"] not in state.get("responses", {}):
+            continue
+        options = list(q["options"])
+        answer = state["responses"][q["question"]]
+        if q.get("multiple_choice", False):
+            responses[str(i)] = [options.index(option) for option in answer]
+        else:
+            responses[str(i)] = options.index(answer)
+    state["responses"] = responses
+    return state
+
+
+def unpack_state(state):
+    state = dict(state)
+    responses = {}
+    for i, answer in state.get("responses", {}).items():
+        q = _all_questions[int(i)]
+        options = list(q["options"])
+        responses[q["question"]] = [options[j] for j in answer] if isinstance(answer, list) else options[answer]
+    state["responses"] = responses
+    return state
+
+
+class SQLiteSessionStore:
+    def __init__(self, path, ttl_seconds=SESSION_TTL_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    token TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def save(self, token, state):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (token, state, updated_at) VALUES (?, ?, ?)",
+                (token, json.dumps(pack_state(state)), time.time()),
+            )
+
+    def load(self, token):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT state FROM sessions WHERE token = ? AND updated_at >= ?",
+                (token, time.time() - self.ttl_seconds),
+            ).fetchone()
+        return unpack_state(json.loads(row[0])) if row is not None else None
+
+
+class RedisSessionStore:
+    def __init__(self, url, ttl_seconds=SESSION_TTL_SECONDS, prefix="pharma-assessment:session:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("The redis package is required for a redis:// SESSION_STORE_URL")
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def save(self, token, state):
+        self.client.set(self.prefix + token, json.dumps(pack_state(state)), ex=self.ttl_seconds)
+
+    def load(self, token):
+        value = self.client.get(self.prefix + token)
+        return unpack_state(json.loads(value)) if value is not None else None
+
+
+def get_session_store(url=SESSION_STORE_URL):
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisSessionStore(url)
+    if url.startswith("sqlite:///"):
+        return SQLiteSessionStore(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported SESSION_STORE_URL: {url}")
@@ -0,0 +1,97 @@
+import argparse
+import os
+import signal
+import socket
+import threading
+import traceback
+
+from assessment import generate_detailed_report, create_pdf
+from jobs import JobQueue
+
+
+REPORTS_DIR = os.getenv("REPORTS_DIR", "reports")
+POLL_SECONDS = float(os.getenv("JOBS_POLL_SECONDS", "2"))
+
+
+# Job handler: long-form detailed report + PDF, written to REPORTS_DIR
+def run_detailed_report(job):
+    payload = job["payload"]
+    user_info = payload["user_info"]
+    report = generate_detailed_report(
+        user_info,
+        payload["total_score"],
+        payload["maturity_level"],
+        payload["responses"],
+    )
+    pdf_buffer = create_pdf(
+        user_info,
+        payload["total_score"],
+        payload["maturity_level"],
+        report,
+        title="Pharma Assessment Detailed Report",
+    )
+
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    pdf_path = os.path.join(REPORTS_DIR, f"detailed_report_{job['id']}.pdf")
+    with open(pdf_path, "wb") as f:
+        f.write(pdf_buffer.getvalue())
+    return {"report": report, "pdf_path": pdf_path}
+
+
+HANDLERS = {
+    "detailed_report": run_detailed_report,
+}
+
+
+# Renews the job's lease until the handler finishes, so long generations are not handed to another worker
+def keep_lease(queue, job, worker_name, done_event):
+    while not done_event.wait(queue.lease_seconds / 3):
+        if not queue.renew(job["id"], worker_name):
+            print(f"[{worker_name}] lost the lease on job {job['id']}")
+            return
+
+
+def work(queue, worker_name, stop_event):
+    while not stop_event.is_set():
+        job = queue.claim(worker_name)
+        if job is None:
+            stop_event.wait(POLL_SECONDS)
+            continue
+
+        print(f"[{worker_name}] running job {job['id']} ({job['kind']}, attempt {job['attempts']})")
+        done_event = threading.Event()
+        heartbeat = threading.Thread(target=keep_lease, args=(queue, job, worker_name, done_event), daemon=True)
+        heartbeat.start()
+        try:
+            result = HANDLERS[job["kind"]](job)
+        except Exception:
+            print(f"[{worker_name}] job {job['id']} failed")
+            queue.fail(job["id"], worker_name, traceback.format_exc())
+        else:
+            queue.complete(job["id"], worker_name, result)
+            print(f"[{worker_name}] job {job['id']} done")
+        finally:
+            done_event.set()
+            heartbeat.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run background report jobs")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("JOBS_CONCURRENCY", "2")),
+                        help="number of jobs this process runs at once")
+    args = parser.parse_args()
+
+    queue = JobQueue()
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+
+    host = socket.gethostname()
+    threads = [
+        threading.Thread(target=work, args=(queue, f"{host}-{os.getpid()}-{i}", stop_event))
+        for i in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()